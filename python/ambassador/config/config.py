@@ -13,7 +13,7 @@
 # limitations under the License
 import socket
 
-from typing import Any, Callable, ClassVar, Dict, Iterable, List, Optional, Tuple, Union
+from typing import Any, Callable, ClassVar, Dict, List, Optional, Sequence, Tuple, Union
 from typing import cast as typecast
 
 import collections
@@ -28,7 +28,7 @@ from multi import multi
 from pkg_resources import Requirement, resource_filename
 from google.protobuf import json_format
 
-from ..utils import RichStatus
+from ..utils import RichStatus, dump_json
 
 from ..resource import Resource
 from .acresource import ACResource
@@ -222,7 +222,7 @@ class Config:
         return od
 
     def as_json(self):
-        return json.dumps(self.as_dict(), sort_keys=True, indent=4)
+        return dump_json(self.as_dict())
 
     # Often good_ambassador_id will be passed an ACResource, but sometimes
     # just a plain old dict.
@@ -275,23 +275,21 @@ class Config:
         """
         self.sources[resource.rkey] = resource
 
-    def load_all(self, resources: Iterable[ACResource]) -> None:
+    def load_all(self, resources: Sequence[ACResource]) -> None:
         """
         Loads all of a set of ACResources. It is the caller's responsibility to arrange for
         the set of ACResources to be sorted in some way that makes sense.
         """
 
-        rcount = 0
+        rcount = len(resources)
 
         for resource in resources:
-            self.logger.debug(f"Trying to parse resource: {resource}")
-
-            rcount += 1
+            self.logger.debug("Trying to parse resource: %s", resource)
 
             if not self.good_ambassador_id(resource):
                 continue
 
-            self.logger.debug("LOAD_ALL: %s @ %s" % (resource, resource.location))
+            self.logger.debug("LOAD_ALL: %s @ %s", resource, resource.location)
 
             rc = self.process(resource)
 
@@ -299,7 +297,7 @@ class Config:
                 # Object error. Not good but we'll allow the system to start.
                 self.post_error(rc, resource=resource)
 
-        self.logger.debug("LOAD_ALL: processed %d resource%s" % (rcount, "" if (rcount == 1) else "s"))
+        self.logger.debug("LOAD_ALL: processed %d resource%s", rcount, "" if (rcount == 1) else "s")
 
         if self.fatal_errors:
             # Kaboom.
@@ -612,8 +610,8 @@ class Config:
                 resource.name = f'{resource.name}.{resource.namespace}'
 
         if allow_log:
-            self.logger.debug("%s: saving %s %s" %
-                              (resource, resource.kind, resource.name))
+            self.logger.debug("%s: saving %s %s",
+                              resource, resource.kind, resource.name)
 
         storage[resource.name] = resource
 
@@ -720,8 +718,8 @@ class Config:
                             (resource, resource.kind, key, storage[key].location),
                             resource=resource)
 
-        self.logger.debug("%s: saving %s %s" %
-                          (resource, resource.kind, key))
+        self.logger.debug("%s: saving %s %s",
+                          resource, resource.kind, key)
 
         storage[key] = resource
 
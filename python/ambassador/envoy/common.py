@@ -14,11 +14,10 @@
 
 from typing import Any, Dict, Optional, Tuple
 
-import json
-
 from abc import abstractmethod
 
 from ..ir import IR, IRResource
+from ..utils import dump_json
 from ..ir.irhttpmappinggroup import IRHTTPMappingGroup
 
 def sanitize_pre_json(input):
@@ -73,7 +72,7 @@ class EnvoyConfig:
         pass
 
     def as_json(self):
-        return json.dumps(sanitize_pre_json(self.as_dict()), sort_keys=True, indent=4)
+        return dump_json(sanitize_pre_json(self.as_dict()))
 
     @classmethod
     def generate(cls, ir: IR, version: str="V2") -> 'EnvoyConfig':
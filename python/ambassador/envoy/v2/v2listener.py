@@ -17,6 +17,7 @@ from typing import cast as typecast
 from os import environ
 
 import json
+import logging
 
 from multi import multi
 from ...ir.irlistener import IRListener
@@ -559,7 +560,8 @@ class V2VirtualHost(dict):
         # because it makes more sense, because this is where we have the domain information.
         # The 1:1 correspondence that this implies between filters and domains may need to
         # change later, of course...
-        self._config.ir.logger.debug(f"V2VirtualHost finalize {jsonify(self.pretty())}")
+        if self._config.ir.logger.isEnabledFor(logging.DEBUG):
+            self._config.ir.logger.debug(f"V2VirtualHost finalize {jsonify(self.pretty())}")
 
         match = {}
 
@@ -956,6 +958,9 @@ class V2Listener(dict):
 
     @classmethod
     def dump_listeners(cls, logger, listeners_by_port) -> None:
+        if not logger.isEnabledFor(logging.DEBUG):
+            return
+
         pretty = { k: v.pretty() for k, v in listeners_by_port.items() }
 
         logger.debug(f"V2Listeners: {json.dumps(pretty, sort_keys=True, indent=4)}")
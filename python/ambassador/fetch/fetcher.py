@@ -1,13 +1,20 @@
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Tuple
 
+import collections
+import concurrent.futures
 import json
 import logging
+import multiprocessing
+import operator
 import os
+import pickle
 import yaml
 import re
 
+from concurrent.futures.process import BrokenProcessPool
+
 from ..config import ACResource, Config
-from ..utils import parse_yaml, dump_yaml
+from ..utils import parse_yaml, dump_yaml, load_yaml, yaml_cacheable, yaml_cache_key, yaml_cache_get, yaml_cache_put
 
 from .resource import NormalizedResource, ResourceManager
 from .k8sobject import KubernetesGVK, KubernetesObject
@@ -51,6 +58,85 @@ HandlerResult = Optional[Tuple[str, List[AnyDict]]]
 k8sLabelMatcher = re.compile(r'([\w\-_./]+)=\"(.+)\"')
 
 
+# When asked to, load_from_filesystem will parse in worker processes once there's
+# more than this much YAML (and more than one CPU to parse it on). Starting the
+# worker pool costs around 0.6s, since each worker has to import ambassador, and
+# libyaml parses roughly 2.5MB/s of typical manifests. Parsing is also only part
+# of loading: on 200 files of 50 Mappings each, about 45% of the time, with
+# emitting resources (in the parent no matter what) taking most of the rest. So
+# even with plenty of CPUs the pool doesn't pay for itself until several MB.
+parallel_parse_threshold = 4 * 1024 * 1024
+
+
+def parse_workers() -> int:
+    """
+    How many processes to parse with: the number of CPUs we're allowed to run on,
+    which in a container can be a lot fewer than the host has.
+    """
+
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        # No sched_getaffinity on this platform (macOS, for example).
+        return os.cpu_count() or 1
+
+
+def total_size(inputs: List[Tuple[str, str]]) -> int:
+    size = 0
+
+    for filepath, _ in inputs:
+        try:
+            size += os.path.getsize(filepath)
+        except OSError:
+            # We'll complain about this when we try to read it.
+            pass
+
+    return size
+
+
+def read_file(filepath: str) -> str:
+    with open(filepath, "r") as f:
+        return f.read()
+
+
+def submit_ahead(executor: concurrent.futures.Executor, workers: int, fn: Callable[[str], Any],
+                 inputs: List[Tuple[str, str]]) -> Iterator[Tuple[str, str, concurrent.futures.Future]]:
+    """
+    Run fn over the filepaths in inputs on executor, yielding (filepath, filename,
+    future) in input order. Only a couple of results per worker are allowed to be
+    outstanding at once, and we don't hang on to futures once they've been handed
+    back, so a big config directory never has to be resident in memory all at once.
+    """
+
+    pending: Deque[Tuple[str, str, concurrent.futures.Future]] = collections.deque()
+
+    for filepath, filename in inputs:
+        pending.append((filepath, filename, executor.submit(fn, filepath)))
+
+        if len(pending) >= 2 * workers:
+            yield pending.popleft()
+
+    while pending:
+        yield pending.popleft()
+
+
+def completed(result: Any) -> concurrent.futures.Future:
+    future: concurrent.futures.Future = concurrent.futures.Future()
+    future.set_result(result)
+    return future
+
+
+def pickle_yaml(serialization: str) -> Tuple[Optional[bytes], Optional[str]]:
+    # This normally runs in a worker process. What it returns has to be pickled to
+    # get back to the parent anyway, so pickle the documents here, in the form the
+    # YAML cache keeps them, and hand back any parse error as a string rather than
+    # trying to pickle the exception.
+    try:
+        return pickle.dumps(load_yaml(serialization), protocol=pickle.HIGHEST_PROTOCOL), None
+    except yaml.error.YAMLError as e:
+        return None, str(e)
+
+
 class ResourceFetcher:
     manager: ResourceManager
     k8s_processor: KubernetesProcessor
@@ -111,7 +197,10 @@ class ResourceFetcher:
         return str(self.manager.locations.current)
 
     def load_from_filesystem(self, config_dir_path, recurse: bool=False,
-                             k8s: bool=False, finalize: bool=True):
+                             k8s: bool=False, finalize: bool=True, parallel: bool=False):
+        # parallel allows parsing a big config directory in worker processes. Only
+        # set it in short-lived, single-threaded callers like the CLI: it's not
+        # worth starting a process pool on every reconfiguration of a server.
         inputs: List[Tuple[str, str]] = []
 
         if os.path.isdir(config_dir_path):
@@ -120,42 +209,130 @@ class ResourceFetcher:
             while dirs:
                 dirpath = dirs.pop(0)
 
-                for filename in os.listdir(dirpath):
-                    filepath = os.path.join(dirpath, filename)
-
-                    if recurse and os.path.isdir(filepath):
-                        # self.logger.debug("%s: RECURSE" % filepath)
-                        dirs.append(filepath)
-                        continue
+                # os.scandir hands back the file type from the directory read itself,
+                # so we don't need to stat every entry. Note that we still follow
+                # symlinks: ConfigMap volumes are full of them.
+                with os.scandir(dirpath) as entries:
+                    for entry in entries:
+                        if recurse and entry.is_dir():
+                            # self.logger.debug("%s: RECURSE" % entry.path)
+                            dirs.append(entry.path)
+                            continue
 
-                    if not os.path.isfile(filepath):
-                        # self.logger.debug("%s: SKIP non-file" % filepath)
-                        continue
+                        if not entry.is_file():
+                            # self.logger.debug("%s: SKIP non-file" % entry.path)
+                            continue
 
-                    if not filename.lower().endswith('.yaml'):
-                        # self.logger.debug("%s: SKIP non-YAML" % filepath)
-                        continue
+                        if not entry.name.lower().endswith('.yaml'):
+                            # self.logger.debug("%s: SKIP non-YAML" % entry.path)
+                            continue
 
-                    # self.logger.debug("%s: SAVE configuration file" % filepath)
-                    inputs.append((filepath, filename))
+                        # self.logger.debug("%s: SAVE configuration file" % entry.path)
+                        inputs.append((entry.path, entry.name))
 
         else:
             # this allows a file to be passed into the ambassador cli
             # rather than just a directory
             inputs.append((config_dir_path, os.path.basename(config_dir_path)))
 
-        for filepath, filename in inputs:
-            self.logger.debug("reading %s (%s)" % (filename, filepath))
+        cpus = parse_workers()
 
-            try:
-                serialization = open(filepath, "r").read()
-                self.parse_yaml(serialization, k8s=k8s, filename=filename, finalize=False)
-            except IOError as e:
-                self.aconf.post_error("could not read YAML from %s: %s" % (filepath, e))
+        if parallel and (cpus > 1) and (total_size(inputs) > parallel_parse_threshold):
+            self.load_in_parallel(inputs, cpus, k8s=k8s)
+        else:
+            # Reading the files is I/O bound, but parsing has to happen serially and in
+            # order, since the ResourceManager tracks locations as it goes. So read ahead
+            # on a thread pool, and parse each file as its contents arrive.
+            readers = min(32, cpus + 4)
+
+            with concurrent.futures.ThreadPoolExecutor(max_workers=readers) as executor:
+                for filepath, filename, read in submit_ahead(executor, readers, read_file, inputs):
+                    self.logger.debug("reading %s (%s)", filename, filepath)
+
+                    try:
+                        serialization = read.result()
+                        self.parse_yaml(serialization, k8s=k8s, filename=filename, finalize=False)
+                    except IOError as e:
+                        self.aconf.post_error("could not read YAML from %s: %s" % (filepath, e))
 
         if finalize:
             self.finalize()
 
+    def load_in_parallel(self, inputs: List[Tuple[str, str]], workers: int, k8s: bool=False) -> None:
+        # With this much YAML, the YAML parser (which holds the GIL) is worth farming
+        # out. So read ahead on a thread pool as usual, but hand anything that isn't
+        # already in the YAML cache off to worker processes, and cache what they send
+        # back. Resources still get emitted here, in order, since the ResourceManager
+        # tracks locations as it goes.
+        #
+        # The workers come from a forkserver where we can get one, rather than being
+        # forked from this process, threads and all.
+        readers = min(32, workers + 4)
+        pending: Deque[Tuple[str, str, Optional[str], concurrent.futures.Future]] = collections.deque()
+        mp_context = None
+
+        if 'forkserver' in multiprocessing.get_all_start_methods():
+            mp_context = multiprocessing.get_context('forkserver')
+
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers, mp_context=mp_context) as parser, \
+             concurrent.futures.ThreadPoolExecutor(max_workers=readers) as reader:
+            for filepath, filename, read in submit_ahead(reader, readers, read_file, inputs):
+                serialization: Optional[str] = None
+
+                try:
+                    serialization = os.path.expandvars(read.result())
+                except IOError as e:
+                    parse: concurrent.futures.Future = concurrent.futures.Future()
+                    parse.set_exception(e)
+                else:
+                    cached: Optional[bytes] = None
+
+                    if yaml_cacheable(serialization):
+                        cached = yaml_cache_get(yaml_cache_key(serialization))
+
+                    if cached is not None:
+                        parse = completed((cached, None))
+                    else:
+                        try:
+                            parse = parser.submit(pickle_yaml, serialization)
+                        except BrokenProcessPool:
+                            parse = completed(pickle_yaml(serialization))
+
+                pending.append((filepath, filename, serialization, parse))
+
+                if len(pending) >= 2 * workers:
+                    self.emit_parsed(*pending.popleft(), k8s=k8s)
+
+            while pending:
+                self.emit_parsed(*pending.popleft(), k8s=k8s)
+
+    def emit_parsed(self, filepath: str, filename: str, serialization: Optional[str],
+                    parse: concurrent.futures.Future, k8s: bool=False) -> None:
+        self.logger.debug("reading %s (%s)", filename, filepath)
+
+        try:
+            pickled, error = parse.result()
+        except IOError as e:
+            self.aconf.post_error("could not read YAML from %s: %s" % (filepath, e))
+            return
+        except BrokenProcessPool:
+            # A worker died (OOM-killed, most likely) and took this parse with it.
+            # That's no reason to give up on the file: parse it here instead.
+            self.logger.warning("lost the parse of %s to a dead worker, retrying", filepath)
+            assert serialization is not None
+            pickled, error = pickle_yaml(serialization)
+
+        if error is not None:
+            self.aconf.post_error("%s: could not parse YAML: %s" % (self.location, error))
+            return
+
+        assert (serialization is not None) and (pickled is not None)
+
+        if yaml_cacheable(serialization):
+            yaml_cache_put(yaml_cache_key(serialization), pickled)
+
+        self.parse_object(objects=pickle.loads(pickled), k8s=k8s, filename=filename)
+
     def parse_yaml(self, serialization: str, k8s=False, rkey: Optional[str]=None,
                    filename: Optional[str]=None, finalize: bool=True, metadata_labels: Optional[Dict[str, str]]=None) -> None:
         # self.logger.info(f"RF YAML: {serialization}")
@@ -308,7 +485,7 @@ class ResourceFetcher:
         handler = getattr(self, handler_name, None)
 
         if not handler:
-            self.logger.debug(f"{self.location}: skipping K8s {obj.gvk}")
+            self.logger.debug("%s: skipping K8s %s", self.location, obj.gvk)
             return
 
         if not self.check_k8s_dup(obj.kind, obj.namespace, obj.name):
@@ -342,7 +519,7 @@ class ResourceFetcher:
 
         self.manager.locations.pop()
 
-    def sorted(self, key=lambda x: x.rkey):  # returns an iterator, probably
+    def sorted(self, key=operator.attrgetter('rkey')) -> List[ACResource]:
         return sorted(self.elements, key=key)
 
     def handle_k8s_ingressclass(self, k8s_object: AnyDict) -> HandlerResult:
@@ -451,15 +628,9 @@ class ResourceFetcher:
         annotations = metadata.get('annotations', {})
         ambassador_annotations = annotations.get('getambassador.io/config', None)
 
-        parsed_ambassador_annotations = None
         if ambassador_annotations is not None:
             self.manager.locations.current.mark_annotation()
 
-            try:
-                parsed_ambassador_annotations = parse_yaml(ambassador_annotations)
-            except yaml.error.YAMLError as e:
-                self.logger.debug("could not parse YAML: %s" % e)
-
         ambassador_id = annotations.get('getambassador.io/ambassador-id', 'default')
 
         # We don't want to deal with non-matching Ambassador IDs
@@ -467,6 +638,14 @@ class ResourceFetcher:
             self.logger.debug(f"Ingress {ingress_name} does not have Ambassador ID {Config.ambassador_id}, ignoring...")
             return None
 
+        # Only parse the annotations once we know we'll actually use them.
+        parsed_ambassador_annotations = None
+        if ambassador_annotations is not None:
+            try:
+                parsed_ambassador_annotations = parse_yaml(ambassador_annotations)
+            except yaml.error.YAMLError as e:
+                self.logger.debug("could not parse YAML: %s", e)
+
         self.logger.debug(f"Handling Ingress {ingress_name}...")
         # We will translate the Ingress resource into Hosts and Mappings,
         # but keep a reference to the k8s resource in aconf for debugging and stats
@@ -778,38 +957,24 @@ class ResourceFetcher:
             return None
 
         metadata_labels: Optional[Dict[str, str]] = metadata.get('labels')
-        resource_name = metadata.get('name') if metadata else None
-        resource_namespace = metadata.get('namespace', 'default') if metadata else None
-
-        annotations = metadata.get('annotations', None) if metadata else None
-        if annotations:
-            annotations = annotations.get('getambassador.io/config', None)
-
-        labels = metadata.get('labels')
+        resource_name = metadata.get('name')
+        resource_namespace = metadata.get('namespace', 'default')
+        annotations = (metadata.get('annotations') or {}).get('getambassador.io/config', None)
 
-        if labels:
-            chart_version = labels.get('helm.sh/chart', None)
+        if metadata_labels:
+            chart_version = metadata_labels.get('helm.sh/chart', None)
 
             if chart_version and not self.helm_chart:
                 self.helm_chart = chart_version
 
-        skip = False
-
-        if not metadata:
-            self.logger.debug("ignoring K8s Service with no metadata")
-            skip = True
-
-        if not skip and not resource_name:
+        if not resource_name:
             self.logger.debug("ignoring K8s Service with no name")
-            skip = True
+            return None
 
-        if not skip and (Config.single_namespace and (resource_namespace != Config.ambassador_namespace)):
+        if Config.single_namespace and (resource_namespace != Config.ambassador_namespace):
             # This should never happen in actual usage, since we shouldn't be given things
             # in the wrong namespace. However, in development, this can happen a lot.
-            self.logger.debug(f"ignoring K8s Service {resource_name}.{resource_namespace} in wrong namespace")
-            skip = True
-
-        if skip:
+            self.logger.debug("ignoring K8s Service %s.%s in wrong namespace", resource_name, resource_namespace)
             return None
 
         # We use this resource identifier as a key into self.k8s_services, and of course for logging .
@@ -833,7 +998,7 @@ class ResourceFetcher:
 
             selector = spec.get('selector', {})
 
-            if self.is_ambassador_service(labels, selector):
+            if self.is_ambassador_service(metadata_labels, selector):
                 self.aconf.post_notice(f"Found Ambassador service: {resource_name}")
                 self.manager.ambassador_service = KubernetesObject(k8s_object, default_namespace='default')
 
@@ -859,7 +1024,7 @@ class ResourceFetcher:
                     result.append(obj)
 
             except yaml.error.YAMLError as e:
-                self.logger.debug("could not parse YAML: %s" % e)
+                self.logger.debug("could not parse YAML: %s", e)
 
         return resource_identifier, result
 
@@ -877,7 +1042,7 @@ class ResourceFetcher:
         skip = False
 
         if (secret_type != 'kubernetes.io/tls') and (secret_type != 'Opaque') and (secret_type != 'istio.io/key-and-cert'):
-            self.logger.debug("ignoring K8s Secret with unknown type %s" % secret_type)
+            self.logger.debug("ignoring K8s Secret with unknown type %s", secret_type)
             skip = True
 
         if not data:
@@ -62,13 +62,16 @@ class KubernetesObject(collections.abc.Mapping):
     """
 
     default_namespace: Optional[str]
+    gvk: KubernetesGVK
 
     def __init__(self, delegate: Dict[str, Any], default_namespace: Optional[str] = None) -> None:
         self.delegate = delegate
         self.default_namespace = default_namespace
 
         try:
-            self.gvk
+            # The GVK gets looked at over and over while processing, so build
+            # it once up front.
+            self.gvk = KubernetesGVK(self['apiVersion'], self['kind'])
             self.name
         except KeyError:
             raise ValueError('delegate is not a valid Kubernetes object')
@@ -82,10 +85,6 @@ class KubernetesObject(collections.abc.Mapping):
     def __len__(self) -> int:
         return len(self.delegate)
 
-    @property
-    def gvk(self) -> KubernetesGVK:
-        return KubernetesGVK(self['apiVersion'], self['kind'])
-
     @property
     def kind(self) -> str:
         return self.gvk.kind
@@ -1,4 +1,4 @@
-from typing import FrozenSet, List, Mapping, Set
+from typing import FrozenSet, List, Mapping, Optional, Set
 
 import collections
 import logging
@@ -15,9 +15,12 @@ class KubernetesProcessor:
     resources.
     """
 
+    _kinds: Optional[FrozenSet[KubernetesGVK]] = None
+
     def kinds(self) -> FrozenSet[KubernetesGVK]:
         # Override kinds to describe the types of resources this processor wants
-        # to process.
+        # to process. The set must not change over the life of the processor:
+        # try_process only asks for it once.
         return frozenset()
 
     def _process(self, obj: KubernetesObject) -> None:
@@ -27,7 +30,13 @@ class KubernetesProcessor:
         pass
 
     def try_process(self, obj: KubernetesObject) -> bool:
-        if obj.gvk not in self.kinds():
+        # This is called for every object we see, often several times over as
+        # it makes its way through aggregating processors, so don't rebuild
+        # the set of kinds every time.
+        if self._kinds is None:
+            self._kinds = self.kinds()
+
+        if obj.gvk not in self._kinds:
             return False
 
         self._process(obj)
@@ -105,10 +114,12 @@ class DeduplicatingKubernetesProcessor (KubernetesProcessor):
         return self.delegate.kinds()
 
     def _process(self, obj: KubernetesObject) -> None:
-        if obj.key in self.cache:
+        key = obj.key
+
+        if key in self.cache:
             return
 
-        self.cache.add(obj.key)
+        self.cache.add(key)
         self.delegate.try_process(obj)
 
     def finalize(self):
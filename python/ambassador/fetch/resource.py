@@ -98,7 +98,7 @@ class ResourceManager:
             return True
 
         if not self.aconf.good_ambassador_id(obj):
-            self.logger.debug("%s ignoring object with mismatched ambassador_id" % self.location)
+            self.logger.debug("%s ignoring object with mismatched ambassador_id", self.location)
             return True
 
         if 'kind' not in obj:
@@ -125,7 +125,7 @@ class ResourceManager:
         if not rkey:
             rkey = self.locations.current.filename
 
-        rkey = "%s.%d" % (rkey, self.locations.current.ocount)
+        rkey = f"{rkey}.{self.locations.current.ocount}"
 
         # self.logger.debug("%s PROCESS %s updated rkey to %s" % (self.location, obj['kind'], rkey))
 
@@ -136,7 +136,7 @@ class ResourceManager:
 
         # Brutal hackery.
         if obj['kind'] == 'Service':
-            self.logger.debug("%s PROCESS saving service %s" % (self.location, obj['name']))
+            self.logger.debug("%s PROCESS saving service %s", self.location, obj['name'])
             self.services[obj['name']] = obj
         else:
             # Fine. Fine fine fine.
@@ -148,7 +148,7 @@ class ResourceManager:
             except Exception as e:
                 self.aconf.post_error(e.args[0])
 
-            self.logger.debug("%s PROCESS %s save %s: %s" % (self.location, obj['kind'], rkey, serialization))
+            self.logger.debug("%s PROCESS %s save %s: %s", self.location, obj['kind'], rkey, serialization)
 
         return True
 
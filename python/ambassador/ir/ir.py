@@ -14,7 +14,6 @@
 from typing import Any, Callable, Dict, Iterable, List, Optional, Union, ValuesView
 from typing import cast as typecast
 
-import json
 import logging
 import os
 
@@ -22,7 +21,7 @@ from ipaddress import ip_address
 
 from ..constants import Constants
 
-from ..utils import RichStatus, SavedSecret, SecretHandler, SecretInfo
+from ..utils import RichStatus, SavedSecret, SecretHandler, SecretInfo, dump_json
 from ..config import Config
 
 from .irresource import IRResource
@@ -714,7 +713,7 @@ class IR:
         return od
 
     def as_json(self) -> str:
-        return json.dumps(self.as_dict(), sort_keys=True, indent=4)
+        return dump_json(self.as_dict())
 
     def features(self) -> Dict[str, Any]:
         od: Dict[str, Union[bool, int, Optional[str]]] = {}
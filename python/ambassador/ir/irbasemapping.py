@@ -1,4 +1,5 @@
 import json
+import logging
 
 from typing import Any, ClassVar, Dict, List, Optional, Tuple, Union, TYPE_CHECKING
 
@@ -103,7 +104,8 @@ class IRBaseMapping (IRResource):
                 ir.logger.debug(f'Breaker validation: good breaker {circuit_breaker["_name"]}')
                 continue
 
-            ir.logger.debug(f'Breaker validation: {json.dumps(circuit_breakers, indent=4, sort_keys=True)}')
+            if ir.logger.isEnabledFor(logging.DEBUG):
+                ir.logger.debug(f'Breaker validation: {json.dumps(circuit_breakers, indent=4, sort_keys=True)}')
 
             name_fields = [ 'cb' ]
 
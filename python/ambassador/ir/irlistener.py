@@ -2,6 +2,7 @@ from typing import Dict, Optional, Tuple, TYPE_CHECKING
 
 import copy
 import json
+import logging
 
 from ..config import Config
 from .irresource import IRResource
@@ -258,6 +259,11 @@ class ListenerFactory:
 
     @classmethod
     def dump_info(cls, ir, what, listeners, unused_contexts):
+        # Building and sorting these dumps isn't free, so don't bother unless
+        # someone's going to see them.
+        if not ir.logger.isEnabledFor(logging.DEBUG):
+            return
+
         ir.logger.debug(f"ListenerFactory: {what}")
 
         pretty_listeners = {k: v.pretty() for k, v in listeners.items()}
@@ -14,21 +14,24 @@
 # See the License for the specific language governing permissions and
 # limitations under the License
 
-from typing import Any, Dict, List, Optional, TextIO, TYPE_CHECKING
+from typing import Any, Dict, List, Optional, TextIO, Union, TYPE_CHECKING
 
 import binascii
 import hashlib
 import io
+import json
 import socket
 import threading
 import time
 import os
 import logging
+import pickle
 import requests
 import tempfile
 import yaml
 
 from .VERSION import Version
+from collections import OrderedDict
 from urllib.parse import urlparse
 
 if TYPE_CHECKING:
@@ -55,19 +58,130 @@ try:
 except AttributeError:
     pass
 
+# orjson is optional. If it's installed, use it for parsing JSON (it's an order of
+# magnitude faster than the stdlib); otherwise, fall back to the json module.
+
+json_fast: Any = None
+
+try:
+    import orjson
+    json_fast = orjson
+except ImportError:
+    pass
+
 yaml_logged_loader = False
 yaml_logged_dumper = False
 
+# The same YAML tends to get parsed over and over again: the same files on every
+# reconfiguration, the same annotations on every snapshot. Keep an LRU cache of
+# parsed documents keyed by a digest of the serialization. Callers are allowed to
+# mutate what parse_yaml hands back, so the cache holds the documents pickled:
+# that's much more compact than a live copy of every object, and unpickling is
+# a good deal cheaper than copy.deepcopy when we need a fresh copy.
+#
+# Big serializations (whole watch snapshots, say) change every time and would
+# only crowd everything else out, so they're never cached, and the cache as a
+# whole is bounded in bytes as well as entries.
+yaml_cache: 'OrderedDict[bytes, bytes]' = OrderedDict()
+yaml_cache_max_entries = 2000
+yaml_cache_max_bytes = 64 * 1024 * 1024
+yaml_cache_max_serialization = 256 * 1024
+yaml_cache_bytes = 0
+yaml_cache_lock = threading.Lock()
+
+
+def yaml_cacheable(serialization: str) -> bool:
+    return len(serialization) <= yaml_cache_max_serialization
+
+
+def yaml_cache_key(serialization: str) -> bytes:
+    return hashlib.blake2b(serialization.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+
+
+def yaml_cache_get(key: bytes) -> Optional[bytes]:
+    """
+    Return the pickled documents cached under key, or None.
+    """
+
+    with yaml_cache_lock:
+        cached = yaml_cache.get(key, None)
+
+        if cached is not None:
+            yaml_cache.move_to_end(key)
+
+    return cached
+
+
+def yaml_cache_put(key: bytes, pickled: bytes) -> None:
+    global yaml_cache_bytes
+
+    with yaml_cache_lock:
+        old = yaml_cache.pop(key, None)
+
+        if old is not None:
+            yaml_cache_bytes -= len(old)
+
+        yaml_cache[key] = pickled
+        yaml_cache_bytes += len(pickled)
+
+        while yaml_cache and ((len(yaml_cache) > yaml_cache_max_entries) or
+                              (yaml_cache_bytes > yaml_cache_max_bytes)):
+            _, evicted = yaml_cache.popitem(last=False)
+            yaml_cache_bytes -= len(evicted)
+
+
+def yaml_cache_clear() -> None:
+    global yaml_cache_bytes
+
+    with yaml_cache_lock:
+        yaml_cache.clear()
+        yaml_cache_bytes = 0
+
+
+def load_yaml(serialization: str) -> List[Any]:
+    """
+    Parse every document in serialization, without going through the cache. You
+    probably want parse_yaml instead.
+    """
 
-def parse_yaml(serialization: str) -> Any:
     global yaml_logged_loader
 
     if not yaml_logged_loader:
         yaml_logged_loader = True
 
-        # logger.info("YAML: using %s parser" % ("Python" if (yaml_loader == yaml.SafeLoader) else "C"))
+        if yaml_loader == yaml.SafeLoader:
+            logger.warning("YAML: libyaml is not available, falling back to the (much slower) Python parser")
+
+    # Drive the loader directly rather than through yaml.load_all's generator.
+    # A loader is bound to a single stream, so it can't be pooled across calls,
+    # but we can at least make sure it's disposed of promptly.
+    loader = yaml_loader(serialization)
+
+    try:
+        objects = []
+
+        while loader.check_data():
+            objects.append(loader.get_data())
+    finally:
+        loader.dispose()
+
+    return objects
+
+
+def parse_yaml(serialization: str) -> Any:
+    if not yaml_cacheable(serialization):
+        return load_yaml(serialization)
+
+    key = yaml_cache_key(serialization)
+    cached = yaml_cache_get(key)
+
+    if cached is not None:
+        return pickle.loads(cached)
+
+    objects = load_yaml(serialization)
+    yaml_cache_put(key, pickle.dumps(objects, protocol=pickle.HIGHEST_PROTOCOL))
 
-    return list(yaml.load_all(serialization, Loader=yaml_loader))
+    return objects
 
 
 def dump_yaml(obj: Any, **kwargs) -> str:
@@ -76,11 +190,39 @@ def dump_yaml(obj: Any, **kwargs) -> str:
     if not yaml_logged_dumper:
         yaml_logged_dumper = True
 
-        # logger.info("YAML: using %s dumper" % ("Python" if (yaml_dumper == yaml.SafeDumper) else "C"))
+        if yaml_dumper == yaml.SafeDumper:
+            logger.warning("YAML: libyaml is not available, falling back to the (much slower) Python dumper")
 
     return yaml.dump(obj, Dumper=yaml_dumper, **kwargs)
 
 
+def parse_json(serialization: Union[str, bytes]) -> Any:
+    """
+    Parse JSON, with orjson if it's available. orjson is stricter than the stdlib
+    (no NaN or Infinity, for example), so anything it rejects gets a second try
+    with json.loads, and errors always come from the stdlib. Note that orjson reads
+    integers too big for 64 bits as floats: use json.loads if that matters.
+    """
+
+    if json_fast:
+        try:
+            return json_fast.loads(serialization)
+        except json_fast.JSONDecodeError:
+            pass
+
+    return json.loads(serialization)
+
+
+def dump_json(obj: Any) -> str:
+    """
+    Serialize obj to JSON with sorted keys and four-space indentation. This is for
+    output people read and diff, so it always comes from the stdlib, whether or
+    not orjson is around.
+    """
+
+    return json.dumps(obj, sort_keys=True, indent=4)
+
+
 def _load_url_contents(logger: logging.Logger, url: str, stream1: TextIO, stream2: Optional[TextIO]=None) -> bool:
     saved = False
 
@@ -802,7 +944,7 @@ class SecretHandler:
 
         if serialization:
             try:
-                objects = parse_yaml(serialization)
+                objects = load_yaml(serialization)
             except yaml.error.YAMLError as e:
                 self.logger.error(f"{resource.kind} {resource.name}: could not parse {source}: {e}")
 
@@ -892,7 +1034,8 @@ class FSSecretHandler(SecretHandler):
         serialization = None
 
         try:
-            serialization = open(source, "r").read()
+            with open(source, "r") as f:
+                serialization = f.read()
         except IOError as e:
             self.logger.error("%s %s: FSSecretHandler could not open %s" %
                               (resource.kind, resource.name, source))
@@ -903,7 +1046,8 @@ class FSSecretHandler(SecretHandler):
         # If serialization is None or empty, we'll just return None.
         if serialization:
             try:
-                objects = parse_yaml(serialization)
+                # Secrets don't belong in the YAML cache, so skip it.
+                objects = load_yaml(serialization)
             except yaml.error.YAMLError as e:
                 self.logger.error("%s %s: could not parse %s: %s" %
                                   (resource.kind, resource.name, source, e))
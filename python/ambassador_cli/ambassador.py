@@ -24,7 +24,6 @@ from typing import cast as typecast
 
 import sys
 
-import json
 import logging
 import os
 import signal
@@ -37,29 +36,42 @@ from ambassador import Scout, Config, IR, Diagnostics, Version
 from ambassador.fetch import ResourceFetcher
 from ambassador.envoy import EnvoyConfig, V2Config
 
-from ambassador.utils import RichStatus, NullSecretHandler
+from ambassador.utils import RichStatus, NullSecretHandler, dump_json, parse_json
 
 __version__ = Version
 
+# The CLI logs at INFO unless told otherwise, either by --debug or by setting
+# AMBASSADOR_LOG_LEVEL (e.g. to WARNING, to keep INFO chatter out of scripts).
+env_log_level = os.environ.get("AMBASSADOR_LOG_LEVEL", "INFO")
+log_level = env_log_level.upper()
+log_level_valid = isinstance(logging.getLevelName(log_level), int)
+
+if not log_level_valid:
+    log_level = "INFO"
+
 logging.basicConfig(
-    level=logging.INFO,
-    format="%%(asctime)s ambassador-cli %s %%(levelname)s: %%(message)s" % __version__,
+    level=log_level,
+    format=f"%(asctime)s ambassador-cli {__version__} %(levelname)s: %(message)s",
     datefmt="%Y-%m-%d %H:%M:%S"
 )
 
 logger = logging.getLogger("ambassador")
 
+if not log_level_valid:
+    logger.warning("AMBASSADOR_LOG_LEVEL %s is not a valid log level, using INFO", env_log_level)
+
 
 def handle_exception(what, e, **kwargs):
-    tb = "\n".join(traceback.format_exception(*sys.exc_info()))
+    # Format the traceback once, for both Scout and the log.
+    tb = traceback.format_exc()
 
     scout = Scout()
     result = scout.report(action=what, mode="cli", exception=str(e), traceback=tb, **kwargs)
 
-    logger.debug("Scout %s, result: %s" %
-                 ("enabled" if scout._scout else "disabled", result))
+    logger.debug("Scout %s, result: %s",
+                 "enabled" if scout._scout else "disabled", result)
 
-    logger.error("%s: %s\n%s" % (what, e, tb))
+    logger.error("%s: %s\n%s", what, e, tb)
 
     show_notices(result)
 
@@ -107,10 +119,63 @@ def showid():
 
 
 def file_checker(path: str) -> bool:
-    logger.debug("CLI file checker: pretending %s exists" % path)
+    logger.debug("CLI file checker: pretending %s exists", path)
     return True
 
 
+def load_aconf(config_dir_path: str, watt: bool=False, k8s: bool=False, recurse: bool=False) -> Config:
+    """
+    Fetch the Ambassador resources from config_dir_path (a WATT snapshot file, if
+    watt is set) and load them into a new Config.
+    """
+
+    aconf = Config()
+    fetcher = ResourceFetcher(logger, aconf)
+
+    if watt:
+        with open(config_dir_path, "r") as f:
+            serialization = f.read()
+
+        fetcher.parse_watt(serialization)
+    else:
+        fetcher.load_from_filesystem(config_dir_path, k8s=k8s, recurse=recurse, parallel=True)
+
+    aconf.load_all(fetcher.sorted())
+
+    return aconf
+
+
+def json_file_looks_complete(path: str, probe: int=4096) -> bool:
+    """
+    Check whether a JSON file we wrote earlier looks intact. Small files just get
+    parsed; for big ones, parsing megabytes of Envoy config only to throw it away
+    is silly. We always write the config indented, and then the only closing brace
+    at the start of a line is the one closing the top-level object, so a file that
+    starts with '{' and ends with '\\n}' was written out in full. Anything else
+    gets parsed after all.
+    """
+
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+
+        if size > 2 * probe:
+            head = f.read(probe).lstrip()
+            f.seek(-probe, os.SEEK_END)
+            tail = f.read().rstrip()
+
+            if head.startswith(b'{') and tail.endswith(b'\n}'):
+                return True
+
+            f.seek(0)
+
+        try:
+            parse_json(f.read())
+            return True
+        except ValueError:
+            # JSONDecodeError, or a truncated multibyte character.
+            return False
+
+
 def dump(config_dir_path: Parameter.REQUIRED, *,
          secret_dir_path=None, watt=False, debug=False, debug_scout=False, k8s=False, recurse=False,
          aconf=False, ir=False, v2=False, diag=False, features=False):
@@ -163,15 +228,7 @@ def dump(config_dir_path: Parameter.REQUIRED, *,
     diagconfig: Optional[EnvoyConfig] = None
 
     try:
-        aconf = Config()
-        fetcher = ResourceFetcher(logger, aconf)
-
-        if watt:
-            fetcher.parse_watt(open(config_dir_path, "r").read())
-        else:
-            fetcher.load_from_filesystem(config_dir_path, k8s=k8s, recurse=True)
-
-        aconf.load_all(fetcher.sorted())
+        aconf = load_aconf(config_dir_path, watt=watt, k8s=k8s, recurse=True)
 
         # aconf.post_error("Error from string, boo yah")
         # aconf.post_error(RichStatus.fromError("Error from RichStatus"))
@@ -212,8 +269,7 @@ def dump(config_dir_path: Parameter.REQUIRED, *,
         # result = scout.report(action="dump", mode="cli", **scout_args)
         # show_notices(result)
 
-        json.dump(od, sys.stdout, sort_keys=True, indent=4)
-        sys.stdout.write("\n")
+        sys.stdout.write(dump_json(od) + "\n")
     except Exception as e:
         handle_exception("EXCEPTION from dump", e,
                          config_dir_path=config_dir_path)
@@ -256,9 +312,9 @@ def config(config_dir_path: Parameter.REQUIRED, output_json_path: Parameter.REQU
         logging.getLogger('ambassador.scout').setLevel(logging.DEBUG)
 
     try:
-        logger.debug("CHECK MODE  %s" % check)
-        logger.debug("CONFIG DIR  %s" % config_dir_path)
-        logger.debug("OUTPUT PATH %s" % output_json_path)
+        logger.debug("CHECK MODE  %s", check)
+        logger.debug("CONFIG DIR  %s", config_dir_path)
+        logger.debug("OUTPUT PATH %s", output_json_path)
 
         dump_aconf: Optional[str] = aconf
         dump_ir: Optional[str] = ir
@@ -273,18 +329,17 @@ def config(config_dir_path: Parameter.REQUIRED, output_json_path: Parameter.REQU
             output_exists = True
 
             try:
-                json.loads(open(output_json_path, "r").read())
+                if not json_file_looks_complete(output_json_path):
+                    logger.warning("output file is not valid JSON")
+                    output_exists = False
             except FileNotFoundError:
                 logger.debug("output file does not exist")
                 output_exists = False
             except OSError:
                 logger.warning("output file is not sane?")
                 output_exists = False
-            except json.decoder.JSONDecodeError:
-                logger.warning("output file is not valid JSON")
-                output_exists = False
 
-            logger.info("Output file %s" % ("exists" if output_exists else "does not exist"))
+            logger.info("Output file %s", "exists" if output_exists else "does not exist")
 
         rc = RichStatus.fromError("impossible error")
 
@@ -293,10 +348,7 @@ def config(config_dir_path: Parameter.REQUIRED, output_json_path: Parameter.REQU
             # a valid config. Regenerate.
             logger.info("Generating new Envoy configuration...")
 
-            aconf = Config()
-            fetcher = ResourceFetcher(logger, aconf)
-            fetcher.load_from_filesystem(config_dir_path, k8s=k8s)
-            aconf.load_all(fetcher.sorted())
+            aconf = load_aconf(config_dir_path, k8s=k8s)
 
             if dump_aconf:
                 with open(dump_aconf, "w") as output:
@@ -329,7 +381,7 @@ def config(config_dir_path: Parameter.REQUIRED, output_json_path: Parameter.REQU
                     output.write(v2config.as_json())
                     output.write("\n")
             else:
-                logger.error("Could not generate new Envoy configuration: %s" % rc.error)
+                logger.error("Could not generate new Envoy configuration: %s", rc.error)
 
         scout = Scout()
         result = scout.report(action="config", mode="cli")
@@ -66,7 +66,7 @@ tvars_cache = ExpiringDict(max_len=10, max_age_seconds=60)
 
 logging.basicConfig(
     level=logging.INFO,
-    format="%%(asctime)s diagd %s [P%%(process)dT%%(threadName)s] %%(levelname)s: %%(message)s" % __version__,
+    format=f"%(asctime)s diagd {__version__} [P%(process)dT%(threadName)s] %(levelname)s: %(message)s",
     datefmt="%Y-%m-%d %H:%M:%S"
 )
 
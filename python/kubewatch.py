@@ -32,7 +32,7 @@ ambassador_basedir = os.environ.get('AMBASSADOR_CONFIG_BASE_DIR', '/ambassador')
 
 logging.basicConfig(
     level=logging.INFO,  # if appDebug else logging.INFO,
-    format="%%(asctime)s kubewatch [%%(process)d T%%(threadName)s] %s %%(levelname)s: %%(message)s" % __version__,
+    format=f"%(asctime)s kubewatch [%(process)d T%(threadName)s] {__version__} %(levelname)s: %(message)s",
     datefmt="%Y-%m-%d %H:%M:%S"
 )
 
@@ -0,0 +1,78 @@
+import json
+import sys
+
+import pytest
+
+from ambassador_cli.ambassador import json_file_looks_complete
+
+# Something shaped roughly like an Envoy config, and big enough that
+# json_file_looks_complete won't just parse it.
+big_config = {
+    'static_resources': {
+        'clusters': [
+            {
+                'name': f'cluster_{i}',
+                'connect_timeout': '3s',
+                'load_assignment': {
+                    'cluster_name': f'cluster_{i}',
+                    'endpoints': [ { 'lb_endpoints': [ { 'endpoint': { 'address': {
+                        'socket_address': { 'address': f'svc-{i}', 'port_value': 80 }
+                    } } } ] } ]
+                }
+            } for i in range(100)
+        ]
+    }
+}
+
+
+@pytest.mark.parametrize('indent', [ 2, 4 ])
+def test_complete(tmp_path, indent):
+    path = tmp_path / 'envoy.json'
+
+    path.write_text(json.dumps(big_config, sort_keys=True, indent=indent))
+    assert path.stat().st_size > 8192
+    assert json_file_looks_complete(str(path))
+
+    path.write_text(json.dumps(big_config, sort_keys=True, indent=indent) + '\n')
+    assert json_file_looks_complete(str(path))
+
+
+@pytest.mark.parametrize('indent', [ 2, 4 ])
+def test_truncated(tmp_path, indent):
+    path = tmp_path / 'envoy.json'
+    serialization = json.dumps(big_config, sort_keys=True, indent=indent).encode('utf-8')
+
+    # Lop the file off everywhere in its last 1500 bytes: none of those may pass, in
+    # particular not the ones just after some nested object's closing brace.
+    for cut in range(len(serialization) - 1500, len(serialization)):
+        path.write_bytes(serialization[:cut])
+        assert not json_file_looks_complete(str(path)), f"truncation at {cut} looks complete"
+
+
+def test_compact(tmp_path):
+    path = tmp_path / 'envoy.json'
+    serialization = json.dumps(big_config, separators=(',', ':'))
+
+    # No newlines to go on here, so this has to be parsed.
+    path.write_text(serialization)
+    assert json_file_looks_complete(str(path))
+
+    path.write_text(serialization[:-1])
+    assert not json_file_looks_complete(str(path))
+
+
+def test_small(tmp_path):
+    path = tmp_path / 'envoy.json'
+
+    path.write_text('{\n    "a": {\n        "b": 1\n    }\n}')
+    assert json_file_looks_complete(str(path))
+
+    path.write_text('{\n    "a": {\n        "b": 1\n    }')
+    assert not json_file_looks_complete(str(path))
+
+    path.write_text('')
+    assert not json_file_looks_complete(str(path))
+
+
+if __name__ == '__main__':
+    pytest.main(sys.argv)
@@ -1,7 +1,11 @@
 import logging
+import multiprocessing
+import os
+import pickle
 import sys
 
 import pytest
+import yaml
 
 logging.basicConfig(
     level=logging.INFO,
@@ -23,6 +27,8 @@ from ambassador.fetch.k8sprocessor import (
     DeduplicatingKubernetesProcessor,
 )
 from ambassador.fetch.ambassador import AmbassadorProcessor
+from ambassador.fetch import fetcher
+from ambassador import utils
 from ambassador.utils import parse_yaml
 
 
@@ -30,6 +36,25 @@ def k8s_object_from_yaml(yaml: str, **kwargs) -> KubernetesObject:
     return KubernetesObject(parse_yaml(yaml)[0], **kwargs)
 
 
+pickle_yaml = fetcher.pickle_yaml
+
+
+def dying_pickle_yaml(serialization: str):
+    # Stands in for fetcher.pickle_yaml, but kills any worker process it runs in.
+    if multiprocessing.parent_process() is not None:
+        os._exit(1)
+
+    return pickle_yaml(serialization)
+
+
+def load_fetcher(config_dir_path: str, parallel: bool=False) -> ResourceFetcher:
+    aconf = Config()
+    fetch = ResourceFetcher(logger, aconf)
+    fetch.load_from_filesystem(config_dir_path, k8s=True, finalize=False, parallel=parallel)
+
+    return fetch
+
+
 valid_knative_ingress = k8s_object_from_yaml('''
 ---
 apiVersion: networking.internal.knative.dev/v1alpha1
@@ -331,5 +356,130 @@ service: test:9999"""
     assert result == ('testservice.default', [expected])
 
 
+def test_parse_yaml_cache_returns_copies():
+    serialization = """---
+apiVersion: getambassador.io/v2
+kind: Mapping
+name: cached_mapping
+prefix: /cached/
+service: cached:9999
+"""
+
+    first = parse_yaml(serialization)
+    first[0]['service'] = 'mutated:9999'
+
+    second = parse_yaml(serialization)
+    assert second[0]['service'] == 'cached:9999'
+    assert second[0] is not first[0]
+
+
+def test_parse_yaml_cache_eviction(monkeypatch):
+    monkeypatch.setattr(utils, 'yaml_cache_max_entries', 3)
+    utils.yaml_cache_clear()
+
+    docs = [ f"name: doc-{i}\n" for i in range(4) ]
+
+    for doc in docs[:3]:
+        parse_yaml(doc)
+
+    # Touch the oldest entry, so that the next one in line is the one to go.
+    parse_yaml(docs[0])
+    parse_yaml(docs[3])
+
+    assert len(utils.yaml_cache) == 3
+    assert utils.yaml_cache_get(utils.yaml_cache_key(docs[0])) is not None
+    assert utils.yaml_cache_get(utils.yaml_cache_key(docs[1])) is None
+    assert utils.yaml_cache_get(utils.yaml_cache_key(docs[2])) is not None
+    assert utils.yaml_cache_get(utils.yaml_cache_key(docs[3])) is not None
+
+
+def test_parse_yaml_cache_size_limits(monkeypatch):
+    utils.yaml_cache_clear()
+
+    # Serializations past the limit don't get cached at all...
+    monkeypatch.setattr(utils, 'yaml_cache_max_serialization', 64)
+    parse_yaml("name: big\nvalue: " + "x" * 64 + "\n")
+    assert len(utils.yaml_cache) == 0
+
+    # ...and the cache as a whole stays under its byte limit.
+    docs = [ f"name: doc-{i}\n" for i in range(4) ]
+    entry_size = len(pickle.dumps(utils.load_yaml(docs[0]), protocol=pickle.HIGHEST_PROTOCOL))
+    monkeypatch.setattr(utils, 'yaml_cache_max_bytes', 3 * entry_size)
+
+    for doc in docs:
+        parse_yaml(doc)
+
+    assert len(utils.yaml_cache) == 3
+    assert utils.yaml_cache_bytes == 3 * entry_size
+    assert utils.yaml_cache_get(utils.yaml_cache_key(docs[0])) is None
+
+
+def test_parse_yaml_cache_skips_errors():
+    utils.yaml_cache_clear()
+    broken = "apiVersion: x\n  bad: [\n"
+
+    for i in range(2):
+        with pytest.raises(yaml.error.YAMLError):
+            parse_yaml(broken)
+
+        assert len(utils.yaml_cache) == 0
+
+
+def test_load_from_filesystem_in_parallel(tmp_path, monkeypatch):
+    for i in range(12):
+        (tmp_path / f"mapping{i:02d}.yaml").write_text(f"""---
+apiVersion: getambassador.io/v2
+kind: Mapping
+metadata:
+  name: mapping-{i}
+  namespace: default
+spec:
+  prefix: /mapping-{i}/
+  service: svc-{i}:80
+---
+apiVersion: getambassador.io/v2
+kind: Mapping
+metadata:
+  name: other-{i}
+  namespace: default
+spec:
+  prefix: /other-{i}/
+  service: other-{i}:80
+""")
+
+    (tmp_path / "mapping05-broken.yaml").write_text("apiVersion: x\n  bad: [\n")
+
+    monkeypatch.setattr(fetcher, 'parse_workers', lambda: 1)
+    serial = load_fetcher(str(tmp_path))
+
+    utils.yaml_cache_clear()
+    monkeypatch.setattr(fetcher, 'parallel_parse_threshold', 1024)
+    monkeypatch.setattr(fetcher, 'parse_workers', lambda: 2)
+
+    # Without being asked to, we never parse in parallel.
+    with monkeypatch.context() as m:
+        m.setattr(ResourceFetcher, 'load_in_parallel', None)
+        load_fetcher(str(tmp_path))
+
+    utils.yaml_cache_clear()
+    parallel = load_fetcher(str(tmp_path), parallel=True)
+
+    assert len(parallel.elements) == 24
+    assert [ dict(r) for r in parallel.elements ] == [ dict(r) for r in serial.elements ]
+    assert parallel.aconf.errors == serial.aconf.errors
+    assert len(parallel.aconf.errors) == 1
+
+    # What the workers parsed should have landed in our cache.
+    assert len(utils.yaml_cache) == 12
+
+    # If a worker dies, we should parse what it lost ourselves rather than give up.
+    utils.yaml_cache_clear()
+    monkeypatch.setattr(fetcher, 'pickle_yaml', dying_pickle_yaml)
+    recovered = load_fetcher(str(tmp_path), parallel=True)
+
+    assert [ dict(r) for r in recovered.elements ] == [ dict(r) for r in serial.elements ]
+    assert recovered.aconf.errors == serial.aconf.errors
+
+
 if __name__ == '__main__':
     pytest.main(sys.argv)
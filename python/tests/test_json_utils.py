@@ -0,0 +1,49 @@
+import json
+import sys
+
+import pytest
+
+from ambassador import utils
+from ambassador.utils import dump_json, parse_json
+
+
+# Run the parse_json tests once with orjson (if it's installed) and once with
+# the stdlib fallback.
+@pytest.fixture(params=[ 'orjson', 'stdlib' ])
+def json_module(request, monkeypatch):
+    if request.param == 'orjson':
+        monkeypatch.setattr(utils, 'json_fast', pytest.importorskip('orjson'))
+    else:
+        monkeypatch.setattr(utils, 'json_fast', None)
+
+    return request.param
+
+
+def test_dump_json_matches_stdlib():
+    obj = {
+        'b': [ 1, 2.5, None, True ],
+        'a': { 'hostname': 'ünïcode.example.com', 'z': 1, 'y': 2 },
+        'big': 123456789012345678901234567890,
+    }
+
+    assert dump_json(obj) == json.dumps(obj, sort_keys=True, indent=4)
+    assert '\\u00fcn\\u00efcode' in dump_json(obj)
+
+
+def test_parse_json(json_module):
+    assert parse_json('{"a": [1, "two", null]}') == { 'a': [ 1, 'two', None ] }
+    assert parse_json(b'{"a": {"b": 1.5}}') == { 'a': { 'b': 1.5 } }
+
+
+def test_parse_json_stdlib_extensions(json_module):
+    # orjson rejects these, but the stdlib (and so parse_json) accepts them.
+    assert parse_json('{"a": Infinity}') == { 'a': float('inf') }
+
+
+def test_parse_json_invalid(json_module):
+    with pytest.raises(json.decoder.JSONDecodeError):
+        parse_json('{"a": [1, 2')
+
+
+if __name__ == '__main__':
+    pytest.main(sys.argv)